@@ -1,9 +1,11 @@
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 import os
-import tempfile
-from main import transcribe_audio_file
-import json
+import uuid
+from streaming_form_data import StreamingFormDataParser
+from streaming_form_data.parser import ParseFailedException
+from streaming_form_data.targets import FileTarget
+from werkzeug.utils import secure_filename
 from pathlib import Path
 
 app = Flask(__name__)
@@ -15,52 +17,84 @@ TRANSCRIPTS_DIR = Path("transcripts")
 FILES_DIR.mkdir(exist_ok=True)
 TRANSCRIPTS_DIR.mkdir(exist_ok=True)
 
+def _safe_filename(filename):
+    """
+    Sanitise a client supplied file name with secure_filename
+    
+    secure_filename drops non-ASCII characters, so names like 'интервью.mp3'
+    collapse to 'mp3'. When the whole stem is lost this way, a name derived
+    from the original is used instead, keeping the extension. It is
+    deterministic so an upload and its saved transcript still share a stem.
+    """
+    stem, suffix = os.path.splitext(Path(filename.replace('\\', '/')).name)
+    if any(c.isalnum() for c in stem) and not secure_filename(stem):
+        suffix = secure_filename(suffix)
+        name = uuid.uuid5(uuid.NAMESPACE_URL, filename).hex
+        return f"{name}.{suffix}" if suffix else name
+    return secure_filename(filename)
+
 @app.route('/api/transcribe', methods=['POST'])
 def transcribe():
     """Handle file upload and transcription"""
+    # Imported here so /api/health doesn't wait on requests/dotenv at startup
+    from main import transcribe_audio_file
+    
     try:
-        # Check if file was uploaded
-        if 'file' not in request.files:
-            return jsonify({'error': 'No file provided'}), 400
-        
-        file = request.files['file']
-        if file.filename == '':
-            return jsonify({'error': 'No file selected'}), 400
-        
-        # Get API key from headers
+        # Get API key from headers before reading the upload body
         auth_header = request.headers.get('Authorization')
         if not auth_header or not auth_header.startswith('Bearer '):
             return jsonify({'error': 'API key required'}), 401
         
         api_key = auth_header.split(' ')[1]
+        if not api_key:
+            return jsonify({'error': 'API key required'}), 401
+        
+        # Uploads must be multipart forms with a 'file' part
+        if request.mimetype != 'multipart/form-data':
+            return jsonify({'error': 'No file provided'}), 400
         
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix=os.path.splitext(file.filename)[1]) as tmp_file:
-            file.save(tmp_file.name)
-            temp_path = tmp_file.name
+        # Parse the multipart body ourselves so the file part is written
+        # straight to disk instead of going through werkzeug's form parser
+        upload_path = FILES_DIR / f".{uuid.uuid4().hex}.upload"
+        target = FileTarget(str(upload_path))
         
         try:
-            # Set API key in environment for this request
-            os.environ['ELEVENLABS_API_KEY'] = api_key
+            try:
+                parser = StreamingFormDataParser(headers={'Content-Type': request.content_type})
+                parser.register('file', target)
+                while chunk := request.stream.read(65536):
+                    parser.data_received(chunk)
+            except ParseFailedException:
+                return jsonify({'error': 'Invalid multipart upload'}), 400
             
-            # Transcribe the file
-            result = transcribe_audio_file(temp_path)
+            # Check if file was uploaded
+            if target.multipart_filename is None:
+                return jsonify({'error': 'No file provided'}), 400
+            if target.multipart_filename == '':
+                return jsonify({'error': 'No file selected'}), 400
             
-            if result:
-                # Save file to files directory
-                file_path = FILES_DIR / file.filename
-                with open(file_path, 'wb') as f:
-                    file.seek(0)  # Reset file pointer
-                    f.write(file.read())
-                
-                return jsonify(result)
-            else:
+            filename = _safe_filename(target.multipart_filename)
+            if not filename:
+                return jsonify({'error': 'Invalid filename'}), 400
+            
+            # Transcribe from the temporary upload, under the client's file name
+            with open(upload_path, 'rb') as f:
+                result = transcribe_audio_file(f, file_name=filename, api_key=api_key)
+            
+            if not result:
                 return jsonify({'error': 'Transcription failed'}), 500
+            
+            # Only successful uploads replace files/<name>. Same directory, so
+            # this is a rename and the bytes are never copied
+            os.replace(upload_path, FILES_DIR / filename)
+            return jsonify(result)
                 
         finally:
-            # Clean up temporary file
-            if os.path.exists(temp_path):
-                os.unlink(temp_path)
+            # Remove the temporary upload unless it was moved into place
+            try:
+                os.unlink(upload_path)
+            except FileNotFoundError:
+                pass
     
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -68,20 +102,26 @@ def transcribe():
 @app.route('/api/save-transcript', methods=['POST'])
 def save_transcript():
     """Save transcript to backend"""
+    from main import dump_json, load_json
+    
     try:
-        data = request.json
+        data = load_json(request.get_data())
         filename = data.get('filename')
         transcript = data.get('transcript')
         
         if not filename or not transcript:
             return jsonify({'error': 'Missing filename or transcript'}), 400
         
+        transcript_stem = Path(_safe_filename(filename)).stem
+        if not transcript_stem:
+            return jsonify({'error': 'Invalid filename'}), 400
+        
         # Save transcript as JSON
-        transcript_filename = os.path.splitext(filename)[0] + '.json'
+        transcript_filename = transcript_stem + '.json'
         transcript_path = TRANSCRIPTS_DIR / transcript_filename
         
-        with open(transcript_path, 'w', encoding='utf-8') as f:
-            json.dump(transcript, f, indent=2, ensure_ascii=False)
+        with open(transcript_path, 'wb') as f:
+            f.write(dump_json(transcript))
         
         return jsonify({'message': 'Transcript saved successfully'})
     
@@ -94,4 +134,8 @@ def health():
     return jsonify({'status': 'healthy', 'message': 'Transcription API is running'})
 
 if __name__ == '__main__':
-    app.run(debug=True, port=5000) 
\ No newline at end of file
+    from waitress import serve
+    from config import API_THREADS
+    
+    serve(app, host=os.getenv('API_HOST', '127.0.0.1'), port=5000, threads=API_THREADS)
+ 
\ No newline at end of file
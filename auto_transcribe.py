@@ -7,24 +7,39 @@ transcribes them if no corresponding transcript exists in /transcripts.
 """
 
 import os
-import json
+import functools
 from pathlib import Path
-from main import transcribe_audio_file, print_transcription_result
-from config import SPEECH_TO_TEXT_CONFIG
-import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from main import transcribe_audio_file, print_transcription_result, dump_json
+from config import SPEECH_TO_TEXT_CONFIG, TRANSCRIBE_CONCURRENCY
 
 # Define supported audio and video file extensions
-SUPPORTED_MEDIA_EXTENSIONS = {
+SUPPORTED_MEDIA_EXTENSIONS = frozenset({
     # Audio
     '.mp3', '.wav', '.m4a', '.flac', '.aac', '.ogg', '.wma', '.aiff',
     # Video
     '.mp4', '.avi', '.mov', '.mkv', '.webm', '.flv', '.wmv', '.m4v'
-}
+})
 
 # Define supported transcript file extensions
-TRANSCRIPT_EXTENSIONS = {
+TRANSCRIPT_EXTENSIONS = frozenset({
     '.txt', '.json', '.srt', '.vtt'
-}
+})
+
+def has_extension(file_name, extensions):
+    """
+    Check a file name's extension (case-insensitive) without building a Path
+    
+    Args:
+        file_name (str): Bare file name, e.g. from os.DirEntry.name
+        extensions (frozenset): Lowercase extensions including the leading dot
+        
+    Returns:
+        bool: True if the extension is in extensions, False otherwise
+    """
+    stem, _, extension = file_name.rpartition('.')
+    # Match Path.suffix: names like 'mp3' or '.mp3' have no extension
+    return bool(stem) and f".{extension.lower()}" in extensions
 
 def get_media_files(media_folder):
     """
@@ -42,12 +57,10 @@ def get_media_files(media_folder):
         media_path.mkdir(parents=True, exist_ok=True)
         return []
     
-    media_files = []
-    for file_path in media_path.iterdir():
-        if file_path.is_file() and file_path.suffix.lower() in SUPPORTED_MEDIA_EXTENSIONS:
-            media_files.append(file_path)
-    
-    return media_files
+    # Cheap name check first; DirEntry.is_file() usually needs no extra stat
+    with os.scandir(media_path) as entries:
+        return [Path(entry.path) for entry in entries
+                if has_extension(entry.name, SUPPORTED_MEDIA_EXTENSIONS) and entry.is_file()]
 
 def get_transcript_files(transcripts_folder):
     """
@@ -65,31 +78,9 @@ def get_transcript_files(transcripts_folder):
         transcripts_path.mkdir(parents=True, exist_ok=True)
         return []
     
-    transcript_files = []
-    for file_path in transcripts_path.iterdir():
-        if file_path.is_file() and file_path.suffix.lower() in TRANSCRIPT_EXTENSIONS:
-            transcript_files.append(file_path)
-    
-    return transcript_files
-
-def has_transcript(media_file_path, transcript_files):
-    """
-    Check if a media file has a corresponding transcript
-    
-    Args:
-        media_file_path (Path): Path to the media file
-        transcript_files (list): List of transcript file paths
-        
-    Returns:
-        bool: True if transcript exists, False otherwise
-    """
-    media_name = media_file_path.stem  # filename without extension
-    
-    for transcript_file in transcript_files:
-        if transcript_file.stem == media_name:
-            return True
-    
-    return False
+    with os.scandir(transcripts_path) as entries:
+        return [Path(entry.path) for entry in entries
+                if has_extension(entry.name, TRANSCRIPT_EXTENSIONS) and entry.is_file()]
 
 def save_transcript(transcript_data, output_path, format_type="json"):
     """
@@ -104,92 +95,217 @@ def save_transcript(transcript_data, output_path, format_type="json"):
     
     if format_type == "json":
         # Save as JSON with full API response
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(transcript_data, f, indent=2, ensure_ascii=False)
+        with open(output_path, 'wb') as f:
+            f.write(dump_json(transcript_data))
     
     elif format_type == "txt":
-        # Save as plain text
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(f"Language: {transcript_data.get('language_code', 'Unknown')}\n")
-            f.write(f"Confidence: {transcript_data.get('language_probability', 0):.2f}\n")
-            f.write(f"Transcription:\n{transcript_data.get('text', 'No text')}\n")
-            
-            # Add speaker information if diarization is enabled
-            words = transcript_data.get('words', [])
-            if words and any(word.get('speaker_id') for word in words):
-                f.write("\nDetailed breakdown with speakers:\n")
-                current_speaker = None
-                for word in words:
-                    speaker_id = word.get('speaker_id')
-                    if speaker_id and speaker_id != current_speaker:
-                        current_speaker = speaker_id
-                        f.write(f"\n[{speaker_id.upper()}]: ")
-                    
-                    word_text = word.get('text', '')
-                    if word.get('type') == 'audio_event':
-                        f.write(f"({word_text}) ")
-                    else:
-                        f.write(f"{word_text} ")
+        # Save as plain text, accumulated as UTF-8 bytes and written once
+        buf = bytearray()
+        buf += f"Language: {transcript_data.get('language_code', 'Unknown')}\n".encode('utf-8')
+        buf += f"Confidence: {transcript_data.get('language_probability', 0):.2f}\n".encode('utf-8')
+        buf += f"Transcription:\n{transcript_data.get('text', 'No text')}\n".encode('utf-8')
+        
+        # Add speaker information if diarization is enabled
+        words = transcript_data.get('words', [])
+        if words and any(word.get('speaker_id') for word in words):
+            buf += b"\nDetailed breakdown with speakers:\n"
+            current_speaker = None
+            for word in words:
+                get = word.get
+                speaker_id = get('speaker_id')
+                word_text = get('text', '')
+                word_type = get('type')
+                
+                if speaker_id and speaker_id != current_speaker:
+                    current_speaker = speaker_id
+                    buf += f"\n[{speaker_id.upper()}]: ".encode('utf-8')
+                
+                if word_type == 'audio_event':
+                    buf += f"({word_text}) ".encode('utf-8')
+                else:
+                    buf += word_text.encode('utf-8')
+                    buf += b" "
+        
+        with open(output_path, 'wb') as f:
+            f.write(buf)
     
     elif format_type == "srt":
-        # Save as SRT subtitle format
-        with open(output_path, 'w', encoding='utf-8') as f:
-            words = transcript_data.get('words', [])
-            if words:
-                subtitle_index = 1
-                current_speaker = None
-                subtitle_text = ""
-                start_time = None
-                end_time = None
+        # Save as SRT subtitle format, assembled in memory as bytes and written once.
+        # Indices and timestamps are ASCII; only subtitle text needs UTF-8 encoding
+        parts = []
+        words = transcript_data.get('words', [])
+        if words:
+            subtitle_index = 1
+            current_speaker = None
+            subtitle_words = []
+            start_time = None
+            end_time = None
+            
+            for word in words:
+                get = word.get
+                speaker_id = get('speaker_id')
+                word_text = get('text', '')
+                word_start = get('start')
+                word_end = get('end')
                 
-                for word in words:
-                    speaker_id = word.get('speaker_id')
-                    word_text = word.get('text', '')
-                    word_start = word.get('start')
-                    word_end = word.get('end')
+                # Start new subtitle if speaker changes or time gap is large
+                if (speaker_id != current_speaker or 
+                    (start_time is not None and word_start and word_start - end_time > 1.0)):
+                    
+                    # Emit previous subtitle if exists
+                    subtitle_text = ' '.join(subtitle_words)
+                    if subtitle_text and start_time is not None and end_time is not None:
+                        start_stamp = format_time(start_time)
+                        end_stamp = format_time(end_time)
+                        parts.append(f"{subtitle_index}\n{start_stamp} --> {end_stamp}\n".encode('ascii'))
+                        parts.append(subtitle_text.strip().encode('utf-8'))
+                        parts.append(b"\n\n")
+                        subtitle_index += 1
                     
-                    # Start new subtitle if speaker changes or time gap is large
-                    if (speaker_id != current_speaker or 
-                        (start_time is not None and word_start and word_start - end_time > 1.0)):
-                        
-                        # Write previous subtitle if exists
-                        if subtitle_text and start_time is not None and end_time is not None:
-                            f.write(f"{subtitle_index}\n")
-                            f.write(f"{format_time(start_time)} --> {format_time(end_time)}\n")
-                            f.write(f"{subtitle_text.strip()}\n\n")
-                            subtitle_index += 1
-                        
-                        # Start new subtitle
-                        current_speaker = speaker_id
-                        subtitle_text = word_text
-                        start_time = word_start
+                    # Start new subtitle
+                    current_speaker = speaker_id
+                    subtitle_words = [word_text]
+                    start_time = word_start
+                    end_time = word_end
+                else:
+                    # Continue current subtitle
+                    subtitle_words.append(word_text)
+                    if word_end:
                         end_time = word_end
-                    else:
-                        # Continue current subtitle
-                        subtitle_text += f" {word_text}"
-                        if word_end:
-                            end_time = word_end
-                
-                # Write final subtitle
-                if subtitle_text and start_time is not None and end_time is not None:
-                    f.write(f"{subtitle_index}\n")
-                    f.write(f"{format_time(start_time)} --> {format_time(end_time)}\n")
-                    f.write(f"{subtitle_text.strip()}\n")
+            
+            # Emit final subtitle
+            subtitle_text = ' '.join(subtitle_words)
+            if subtitle_text and start_time is not None and end_time is not None:
+                start_stamp = format_time(start_time)
+                end_stamp = format_time(end_time)
+                parts.append(f"{subtitle_index}\n{start_stamp} --> {end_stamp}\n".encode('ascii'))
+                parts.append(subtitle_text.strip().encode('utf-8'))
+                parts.append(b"\n")
+        
+        with open(output_path, 'wb') as f:
+            f.write(b''.join(parts))
 
+@functools.lru_cache(maxsize=4096)
 def format_time(seconds):
     """Format seconds to SRT time format (HH:MM:SS,mmm)"""
     if seconds is None:
         return "00:00:00,000"
     
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
-    millisecs = int((seconds % 1) * 1000)
+    # Work in whole milliseconds to avoid float modulo rounding errors
+    millisecs = int(seconds * 1000 + 0.5)
+    secs, millisecs = divmod(millisecs, 1000)
+    minutes, secs = divmod(secs, 60)
+    hours, minutes = divmod(minutes, 60)
     
     return f"{hours:02d}:{minutes:02d}:{secs:02d},{millisecs:03d}"
 
+def prefetch_file(file_path):
+    """
+    Ask the kernel to start reading a file into the page cache ahead of use
+    
+    Does nothing on platforms without posix_fadvise or if the file can't be opened.
+    
+    Args:
+        file_path (Path): Path to the file to prefetch
+    """
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    
+    try:
+        fd = os.open(file_path, os.O_RDONLY)
+    except OSError:
+        return
+    
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def transcribe_with_prefetch(media_file, next_file, custom_config=None):
+    """
+    Transcribe a media file after hinting the kernel to prefetch the next one
+    
+    Args:
+        media_file (Path): Media file to transcribe now
+        next_file (Path): Media file that will be transcribed next, or None
+        custom_config (dict): Custom configuration for transcription
+        
+    Returns:
+        dict: Transcription result, or None if transcription failed
+    """
+    if next_file is not None:
+        prefetch_file(next_file)
+    return transcribe_audio_file(str(media_file), custom_config)
+
+def transcribe_batch(files_to_process, transcripts_folder, output_format,
+                     custom_config=None, max_workers=TRANSCRIBE_CONCURRENCY):
+    """
+    Transcribe media files concurrently and save each transcript as it completes
+    
+    Args:
+        files_to_process (list): Media file paths to transcribe
+        transcripts_folder (str): Path to transcripts folder
+        output_format (str): Output format ('json', 'txt', 'srt')
+        custom_config (dict): Custom configuration for transcription
+        max_workers (int): Maximum number of requests in flight at once
+        
+    Returns:
+        tuple: (successful, failed) transcription counts
+    """
+    successful_transcriptions = 0
+    failed_transcriptions = 0
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Each task prefetches the file queued max_workers places behind it,
+        # which starts as soon as a worker frees up, so reading it from disk
+        # overlaps with the uploads already in flight
+        futures = {}
+        for i, media_file in enumerate(files_to_process):
+            next_index = i + max_workers
+            next_file = files_to_process[next_index] if next_index < len(files_to_process) else None
+            future = executor.submit(transcribe_with_prefetch, media_file, next_file, custom_config)
+            futures[future] = media_file
+        
+        # Results are saved on this thread, so the counters need no locking
+        for i, future in enumerate(as_completed(futures), 1):
+            media_file = futures[future]
+            media_name = media_file.name
+            print(f"🎯 Finished {i}/{len(files_to_process)}: {media_name}")
+            
+            try:
+                result = future.result()
+                
+                if result:
+                    # Create output filename
+                    output_filename = f"{media_file.stem}.{output_format}"
+                    output_path = Path(transcripts_folder) / output_filename
+                    
+                    # Save the transcript
+                    save_transcript(result, output_path, output_format)
+                    
+                    print(f"   ✅ Successfully transcribed and saved to: {output_path}")
+                    print(f"   📝 Language: {result.get('language_code', 'Unknown')} "
+                          f"(confidence: {result.get('language_probability', 0):.2f})")
+                    print(f"   🗣️  Text: {result.get('text', 'No text')[:100]}{'...' if len(result.get('text', '')) > 100 else ''}")
+                    
+                    successful_transcriptions += 1
+                else:
+                    print(f"   ❌ Failed to transcribe {media_name}")
+                    failed_transcriptions += 1
+                    
+            except Exception as e:
+                print(f"   ❌ Error processing {media_name}: {e}")
+                failed_transcriptions += 1
+            
+            print()
+    
+    return successful_transcriptions, failed_transcriptions
+
 def process_media_files(media_folder="files", transcripts_folder="transcripts", 
-                       output_format="json", custom_config=None):
+                       output_format="json", custom_config=None,
+                       max_workers=TRANSCRIBE_CONCURRENCY):
     """
     Process all audio and video files that don't have corresponding transcripts
     
@@ -198,6 +314,7 @@ def process_media_files(media_folder="files", transcripts_folder="transcripts",
         transcripts_folder (str): Path to transcripts folder
         output_format (str): Output format ('json', 'txt', 'srt')
         custom_config (dict): Custom configuration for transcription
+        max_workers (int): Maximum number of transcriptions in flight at once
     """
     print("🎵 Automated Transcription System (Audio & Video)")
     print("=" * 50)
@@ -214,11 +331,10 @@ def process_media_files(media_folder="files", transcripts_folder="transcripts",
         print("No audio or video files found. Please add files to the 'files' folder.")
         return
     
-    # Find files that need transcription
-    files_to_process = []
-    for media_file in media_files:
-        if not has_transcript(media_file, transcript_files):
-            files_to_process.append(media_file)
+    # Find files that need transcription (a transcript shares its media file's stem)
+    transcript_stems = {transcript_file.stem for transcript_file in transcript_files}
+    files_to_process = [media_file for media_file in media_files
+                        if media_file.stem not in transcript_stems]
     
     print(f"🔄 Found {len(files_to_process)} files that need transcription:")
     for file in files_to_process:
@@ -229,40 +345,10 @@ def process_media_files(media_folder="files", transcripts_folder="transcripts",
         print("✅ All audio/video files already have transcripts!")
         return
     
-    # Process each file
-    successful_transcriptions = 0
-    failed_transcriptions = 0
-    
-    for i, media_file in enumerate(files_to_process, 1):
-        print(f"🎯 Processing {i}/{len(files_to_process)}: {media_file.name}")
-        
-        try:
-            # Transcribe the media file
-            result = transcribe_audio_file(str(media_file), custom_config)
-            
-            if result:
-                # Create output filename
-                output_filename = f"{media_file.stem}.{output_format}"
-                output_path = Path(transcripts_folder) / output_filename
-                
-                # Save the transcript
-                save_transcript(result, output_path, output_format)
-                
-                print(f"   ✅ Successfully transcribed and saved to: {output_path}")
-                print(f"   📝 Language: {result.get('language_code', 'Unknown')} "
-                      f"(confidence: {result.get('language_probability', 0):.2f})")
-                print(f"   🗣️  Text: {result.get('text', 'No text')[:100]}{'...' if len(result.get('text', '')) > 100 else ''}")
-                
-                successful_transcriptions += 1
-            else:
-                print(f"   ❌ Failed to transcribe {media_file.name}")
-                failed_transcriptions += 1
-                
-        except Exception as e:
-            print(f"   ❌ Error processing {media_file.name}: {e}")
-            failed_transcriptions += 1
-        
-        print()
+    # Process files concurrently
+    successful_transcriptions, failed_transcriptions = transcribe_batch(
+        files_to_process, transcripts_folder, output_format, custom_config, max_workers
+    )
     
     # Summary
     print("=" * 50)
@@ -275,18 +361,21 @@ def process_media_files(media_folder="files", transcripts_folder="transcripts",
         print(f"\n📂 Transcripts saved in: {transcripts_folder}/")
 
 def main():
+    import argparse
+    
     print("🚀 Starting automated transcription...\n")
     parser = argparse.ArgumentParser(description="Automated Transcription Script")
     parser.add_argument('--input', type=str, help='Path to a single audio/video file to transcribe')
     parser.add_argument('--output_dir', type=str, default="transcripts", help='Directory to save transcripts')
     parser.add_argument('--output_format', type=str, default="json", help='Transcript format: json, txt, srt')
+    parser.add_argument('--workers', type=int, default=TRANSCRIBE_CONCURRENCY,
+                        help='Number of files to transcribe concurrently in batch mode')
     args = parser.parse_args()
 
     custom_config = {}
 
     if args.input:
         # Single file mode
-        from pathlib import Path
         media_file = Path(args.input)
         if not media_file.exists():
             print(f"File {args.input} does not exist.")
@@ -306,7 +395,8 @@ def main():
             media_folder="files",
             transcripts_folder=args.output_dir,
             output_format=args.output_format,
-            custom_config=custom_config
+            custom_config=custom_config,
+            max_workers=args.workers
         )
 
 if __name__ == "__main__":
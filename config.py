@@ -7,6 +7,23 @@ load_dotenv()
 # API Configuration
 ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY")
 
+# Worker threads for the API server (python api.py). Requests spend most of
+# their time waiting on the ElevenLabs API, so run far more than CPU cores
+API_THREADS = int(os.getenv("API_THREADS", (os.cpu_count() or 1) * 5))
+
+# Maximum number of transcription requests in flight during batch processing
+TRANSCRIBE_CONCURRENCY = int(os.getenv("TRANSCRIBE_CONCURRENCY", 8))
+
+# Directory for cached transcription results, keyed by audio content and config
+TRANSCRIPTION_CACHE_DIR = os.getenv("TRANSCRIPTION_CACHE_DIR", ".transcribe_cache")
+
+# Optional S3 bucket for large files (requires boto3). Files bigger than
+# LARGE_FILE_THRESHOLD are uploaded there in parallel parts and transcribed
+# via a presigned URL instead of being posted to the API directly
+S3_UPLOAD_BUCKET = os.getenv("S3_UPLOAD_BUCKET")
+S3_UPLOAD_PREFIX = os.getenv("S3_UPLOAD_PREFIX", "transcribe-uploads/")
+LARGE_FILE_THRESHOLD = 50 * 1024 * 1024  # 50 MB
+
 # Speech-to-Text Model Configuration
 # All parameters from https://elevenlabs.io/docs/api-reference/speech-to-text/convert
 SPEECH_TO_TEXT_CONFIG = {
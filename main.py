@@ -1,48 +1,260 @@
 import requests
-from config import ELEVENLABS_API_KEY, SPEECH_TO_TEXT_CONFIG
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config import (
+    ELEVENLABS_API_KEY, SPEECH_TO_TEXT_CONFIG, TRANSCRIPTION_CACHE_DIR,
+    API_THREADS, TRANSCRIBE_CONCURRENCY,
+    S3_UPLOAD_BUCKET, S3_UPLOAD_PREFIX, LARGE_FILE_THRESHOLD
+)
+from contextlib import nullcontext
+from pathlib import Path
+import functools
+import hashlib
+import json
 import os
+import tempfile
+import uuid
 
-def transcribe_audio_file(audio_file_path, custom_config=None):
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library json module
+    orjson = None
+
+# Shared session so repeated calls reuse pooled TCP/TLS connections, with
+# exponential backoff on rate limiting and transient server errors. The pool
+# keeps one connection per API worker thread or batch worker; beyond that,
+# requests still go out but their connections are closed instead of reused
+_POOL_SIZE = max(API_THREADS, TRANSCRIBE_CONCURRENCY)
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=_POOL_SIZE,
+    max_retries=Retry(
+        total=5,
+        backoff_factor=1.0,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["POST"],
+        raise_on_status=False  # Hand the final error response back to the caller
+    )
+))
+
+def dump_json(data, indent=True):
+    """
+    Serialize data to UTF-8 encoded JSON, using orjson when it is installed
+    
+    Args:
+        data: JSON-serializable object
+        indent (bool): Pretty-print with two-space indentation
+        
+    Returns:
+        bytes: Encoded JSON document
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(data, indent=2 if indent else None, ensure_ascii=False).encode('utf-8')
+
+def load_json(data):
+    """Parse a JSON document from bytes or str, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def _merge_config(custom_items):
+    """Merge custom config items over the defaults and filter out None values to avoid API errors"""
+    config = SPEECH_TO_TEXT_CONFIG.copy()
+    config.update(custom_items)
+    return {k: v for k, v in config.items() if v is not None}
+
+_merge_config_cached = functools.lru_cache(maxsize=32)(_merge_config)
+
+def _prepare_config(custom_config=None):
+    """
+    Build the request config for a transcription call
+    
+    Batch jobs pass the same custom config for every file, so the merged
+    result is memoized. The returned dict is shared and must not be modified.
+    
+    Args:
+        custom_config (dict, optional): Custom configuration to override defaults
+        
+    Returns:
+        dict: Merged config without None values
+    """
+    custom_items = tuple(sorted((custom_config or {}).items()))
+    try:
+        return _merge_config_cached(custom_items)
+    except TypeError:
+        # Unhashable values (e.g. additional_formats lists) can't be memoized
+        return _merge_config(custom_items)
+
+def _cache_key(audio_file, config, api_key):
+    """
+    Hash the audio content together with the request config and API key
+    
+    The key is included so a cached result is only returned to the account
+    that paid for it, not to any caller with the same audio.
+    
+    Args:
+        audio_file (file): Open binary file; its position is restored afterwards
+        config (dict): Final request config sent to the API
+        api_key (str): ElevenLabs API key the request is made with
+        
+    Returns:
+        str: Hex digest identifying this transcription request
+    """
+    key = hashlib.sha256()
+    position = audio_file.tell()
+    for chunk in iter(lambda: audio_file.read(1 << 20), b''):
+        key.update(chunk)
+    audio_file.seek(position)
+    key.update(json.dumps(config, sort_keys=True).encode())
+    key.update(hashlib.sha256(api_key.encode()).digest())
+    return key.hexdigest()
+
+def _load_cached_result(cache_key):
+    """Return a previously saved transcription result, or None on a cache miss"""
+    try:
+        with open(Path(TRANSCRIPTION_CACHE_DIR) / f"{cache_key}.json", 'rb') as f:
+            return load_json(f.read())
+    except (FileNotFoundError, ValueError):
+        return None
+    except OSError as e:
+        # The cache is an optimisation, so an unreadable cache is a miss
+        print(f"Could not read cached transcription: {e}")
+        return None
+
+def _save_cached_result(cache_key, result):
+    """Save a transcription result atomically so readers never see a partial file"""
+    cache_dir = Path(TRANSCRIPTION_CACHE_DIR)
+    temp_path = None
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile('wb', dir=cache_dir, suffix='.tmp', delete=False) as f:
+            temp_path = f.name
+            f.write(dump_json(result, indent=False))
+        os.replace(temp_path, cache_dir / f"{cache_key}.json")
+    except OSError as e:
+        # Failing to cache must not lose a transcription that was paid for
+        print(f"Could not save cached transcription: {e}")
+        if temp_path is not None:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+
+def _remaining_size(audio_file):
+    """Return the number of bytes between the current position and the end of the file"""
+    position = audio_file.tell()
+    size = audio_file.seek(0, os.SEEK_END) - position
+    audio_file.seek(position)
+    return size
+
+def _transcribe_via_s3(audio_file, file_name, custom_config=None, api_key=None):
+    """
+    Upload a large file to S3 in parallel parts and transcribe it from there
+    
+    Args:
+        audio_file (file): Open binary file to upload
+        file_name (str): Original file name, used in the object key
+        custom_config (dict, optional): Custom configuration to override defaults
+        api_key (str, optional): ElevenLabs API key, defaults to ELEVENLABS_API_KEY
+        
+    Returns:
+        dict: Transcription result with text, words, language info, etc.
+    """
+    # Optional dependency, only needed when S3_UPLOAD_BUCKET is configured
+    import boto3
+    from boto3.s3.transfer import TransferConfig
+    
+    transfer_config = TransferConfig(
+        multipart_threshold=16 * 1024 * 1024,
+        multipart_chunksize=16 * 1024 * 1024,
+        max_concurrency=8,
+        use_threads=True
+    )
+    s3 = boto3.client("s3")
+    key = f"{S3_UPLOAD_PREFIX}{uuid.uuid4().hex}-{file_name}"
+    s3.upload_fileobj(audio_file, S3_UPLOAD_BUCKET, key, Config=transfer_config)
+    
+    try:
+        # Presigned so ElevenLabs can read the object without a public bucket
+        url = s3.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": S3_UPLOAD_BUCKET, "Key": key},
+            ExpiresIn=3600
+        )
+        return transcribe_from_cloud_storage(url, custom_config, api_key)
+    finally:
+        # A leftover object only costs storage, so don't let it hide the result
+        try:
+            s3.delete_object(Bucket=S3_UPLOAD_BUCKET, Key=key)
+        except Exception as e:
+            print(f"Could not delete s3://{S3_UPLOAD_BUCKET}/{key}: {e}")
+
+def transcribe_audio_file(audio_file_path, custom_config=None, file_name=None, api_key=None):
     """
     Transcribe audio file using ElevenLabs Speech-to-Text API with direct requests
     
     Args:
-        audio_file_path (str): Path to the audio file to transcribe
+        audio_file_path (str or file): Path to the audio file to transcribe, or an
+            open binary file object to read from
         custom_config (dict, optional): Custom configuration to override defaults
+        file_name (str, optional): File name sent to the API, defaults to the
+            name of the file being read
+        api_key (str, optional): ElevenLabs API key, defaults to ELEVENLABS_API_KEY
         
     Returns:
         dict: Transcription result with text, words, language info, etc.
     """
-    if not os.path.exists(audio_file_path):
+    if hasattr(audio_file_path, 'read'):
+        audio_file = audio_file_path
+        file_name = file_name or Path(getattr(audio_file, 'name', 'audio')).name
+    elif not os.path.exists(audio_file_path):
         raise FileNotFoundError(f"Audio file not found: {audio_file_path}")
+    else:
+        audio_file = None
+        file_name = file_name or Path(audio_file_path).name
     
-    if not ELEVENLABS_API_KEY:
+    api_key = api_key or ELEVENLABS_API_KEY
+    if not api_key:
         raise ValueError("ELEVENLABS_API_KEY not found in environment variables. Please set it in your .env file.")
     
-    # Merge custom config with default config
-    config = SPEECH_TO_TEXT_CONFIG.copy()
-    if custom_config:
-        config.update(custom_config)
-    
-    # Filter out None values to avoid API errors
-    config = {k: v for k, v in config.items() if v is not None}
+    config = _prepare_config(custom_config)
     
     try:
-        # Use direct requests API call (same as your working example)
-        response = requests.post(
-            "https://api.elevenlabs.io/v1/speech-to-text",
-            headers={
-                "xi-api-key": ELEVENLABS_API_KEY
-            },
-            data=config,
-            files={
-                'file': (os.path.basename(audio_file_path), open(audio_file_path, 'rb'))
-            }
-        )
+        # Only close the file if we opened it ourselves
+        with (nullcontext(audio_file) if audio_file is not None else open(audio_file_path, 'rb')) as fh:
+            # Reuse a previous result for identical audio and settings
+            cache_key = _cache_key(fh, config, api_key)
+            cached = _load_cached_result(cache_key)
+            if cached is not None:
+                return cached
+            
+            # Send large files through S3 in parallel parts when a bucket is configured
+            if S3_UPLOAD_BUCKET and _remaining_size(fh) > LARGE_FILE_THRESHOLD:
+                result = _transcribe_via_s3(fh, file_name, custom_config, api_key)
+                if result:
+                    _save_cached_result(cache_key, result)
+                return result
+            
+            # requests builds the multipart body in memory, so the whole file
+            # is read before sending; use the S3 path above for very large media
+            response = _SESSION.post(
+                "https://api.elevenlabs.io/v1/speech-to-text",
+                headers={
+                    "xi-api-key": api_key
+                },
+                data=config,
+                files={
+                    'file': (file_name, fh)
+                }
+            )
         
         # Check if request was successful
         if response.status_code == 200:
-            return response.json()
+            result = load_json(response.content)
+            _save_cached_result(cache_key, result)
+            return result
         else:
             print(f"API Error: {response.status_code} - {response.text}")
             return None
@@ -51,44 +263,38 @@ def transcribe_audio_file(audio_file_path, custom_config=None):
         print(f"Error during transcription: {e}")
         return None
 
-def transcribe_from_cloud_storage(cloud_storage_url, custom_config=None):
+def transcribe_from_cloud_storage(cloud_storage_url, custom_config=None, api_key=None):
     """
     Transcribe audio from cloud storage URL using ElevenLabs Speech-to-Text API
     
     Args:
         cloud_storage_url (str): Valid AWS S3, Cloudflare R2 or Google Cloud Storage URL
         custom_config (dict, optional): Custom configuration to override defaults
+        api_key (str, optional): ElevenLabs API key, defaults to ELEVENLABS_API_KEY
         
     Returns:
         dict: Transcription result with text, words, language info, etc.
     """
-    if not ELEVENLABS_API_KEY:
+    api_key = api_key or ELEVENLABS_API_KEY
+    if not api_key:
         raise ValueError("ELEVENLABS_API_KEY not found in environment variables. Please set it in your .env file.")
     
-    # Merge custom config with default config
-    config = SPEECH_TO_TEXT_CONFIG.copy()
-    if custom_config:
-        config.update(custom_config)
-    
-    # Add cloud storage URL to config
-    config["cloud_storage_url"] = cloud_storage_url
-    
-    # Filter out None values to avoid API errors
-    config = {k: v for k, v in config.items() if v is not None}
+    # Add cloud storage URL to a copy of the shared config
+    config = {**_prepare_config(custom_config), "cloud_storage_url": cloud_storage_url}
     
     try:
         # Use direct requests API call for cloud storage
-        response = requests.post(
+        response = _SESSION.post(
             "https://api.elevenlabs.io/v1/speech-to-text",
             headers={
-                "xi-api-key": ELEVENLABS_API_KEY
+                "xi-api-key": api_key
             },
             data=config
         )
         
         # Check if request was successful
         if response.status_code == 200:
-            return response.json()
+            return load_json(response.content)
         else:
             print(f"API Error: {response.status_code} - {response.text}")
             return None
@@ -116,19 +322,24 @@ def print_transcription_result(result):
     words = result.get('words', [])
     if words:
         print("\nDetailed breakdown:")
+        # Collect the breakdown and print it once instead of once per word
+        parts = []
         current_speaker = None
         for word in words:
-            speaker_id = word.get('speaker_id')
+            get = word.get
+            speaker_id = get('speaker_id')
+            word_text = get('text', '')
+            word_type = get('type')
+            
             if speaker_id and speaker_id != current_speaker:
                 current_speaker = speaker_id
-                print(f"\n[{speaker_id.upper()}]: ", end="")
+                parts.append(f"\n[{speaker_id.upper()}]: ")
             
-            word_text = word.get('text', '')
-            if word.get('type') == 'audio_event':
-                print(f"({word_text}) ", end="")
+            if word_type == 'audio_event':
+                parts.append(f"({word_text}) ")
             else:
-                print(f"{word_text} ", end="")
-        print("\n")
+                parts.append(f"{word_text} ")
+        print(''.join(parts) + "\n")
     
     # Print additional formats if available
     additional_formats = result.get('additional_formats')
@@ -0,0 +1,126 @@
+import io
+import json
+import re
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+import api
+import main
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(api, "FILES_DIR", tmp_path / "files")
+    monkeypatch.setattr(api, "TRANSCRIPTS_DIR", tmp_path / "transcripts")
+    (tmp_path / "files").mkdir()
+    (tmp_path / "transcripts").mkdir()
+    return api.app.test_client()
+
+
+def _upload(client, data=b"new audio", filename="clip.mp3"):
+    return client.post(
+        "/api/transcribe",
+        data={"file": (io.BytesIO(data), filename)},
+        headers={"Authorization": "Bearer request-key"},
+        content_type="multipart/form-data",
+    )
+
+
+def test_transcribe_saves_media_on_success(client):
+    with mock.patch.object(main, "transcribe_audio_file", return_value={"text": "hi"}) as transcribe:
+        response = _upload(client)
+
+    assert response.status_code == 200
+    assert response.get_json() == {"text": "hi"}
+    assert transcribe.call_args.kwargs == {"file_name": "clip.mp3", "api_key": "request-key"}
+    assert [p.name for p in api.FILES_DIR.iterdir()] == ["clip.mp3"]
+    assert (api.FILES_DIR / "clip.mp3").read_bytes() == b"new audio"
+
+
+def test_transcribe_rejects_empty_bearer_token(client):
+    with mock.patch.object(main, "transcribe_audio_file") as transcribe:
+        response = client.post(
+            "/api/transcribe",
+            data={"file": (io.BytesIO(b"new audio"), "clip.mp3")},
+            headers={"Authorization": "Bearer "},
+            content_type="multipart/form-data",
+        )
+
+    assert response.status_code == 401
+    transcribe.assert_not_called()
+
+
+def test_failed_transcription_keeps_existing_media(client):
+    (api.FILES_DIR / "clip.mp3").write_bytes(b"original audio")
+
+    with mock.patch.object(main, "transcribe_audio_file", return_value=None):
+        response = _upload(client)
+
+    assert response.status_code == 500
+    assert [p.name for p in api.FILES_DIR.iterdir()] == ["clip.mp3"]
+    assert (api.FILES_DIR / "clip.mp3").read_bytes() == b"original audio"
+
+
+def test_save_transcript_writes_json_under_sanitised_name(client):
+    response = client.post(
+        "/api/save-transcript",
+        json={"filename": "my clip.mp3", "transcript": {"text": "hi"}},
+    )
+
+    assert response.status_code == 200
+    assert json.loads((api.TRANSCRIPTS_DIR / "my_clip.json").read_bytes()) == {"text": "hi"}
+
+
+def test_save_transcript_rejects_filename_that_sanitises_to_nothing(client):
+    response = client.post(
+        "/api/save-transcript",
+        json={"filename": "../", "transcript": {"text": "hi"}},
+    )
+
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "Invalid filename"}
+    assert list(api.TRANSCRIPTS_DIR.iterdir()) == []
+
+
+def test_non_ascii_filename_keeps_extension_and_pairs_with_transcript(client):
+    with mock.patch.object(main, "transcribe_audio_file", return_value={"text": "hi"}) as transcribe:
+        response = _upload(client, filename="интервью.mp3")
+        _upload(client, filename="日本語.mp3")
+
+    assert response.status_code == 200
+    media_names = sorted(p.name for p in api.FILES_DIR.iterdir())
+    assert len(media_names) == 2
+    assert all(re.fullmatch(r"[0-9a-f]{32}\.mp3", name) for name in media_names)
+    assert transcribe.call_args_list[0].kwargs["file_name"] in media_names
+
+    client.post(
+        "/api/save-transcript",
+        json={"filename": "интервью.mp3", "transcript": {"text": "hi"}},
+    )
+    [transcript] = api.TRANSCRIPTS_DIR.iterdir()
+    assert transcript.stem == Path(transcribe.call_args_list[0].kwargs["file_name"]).stem
+
+
+def test_transcribe_rejects_non_multipart_body(client):
+    response = client.post(
+        "/api/transcribe",
+        json={"file": "clip.mp3"},
+        headers={"Authorization": "Bearer request-key"},
+    )
+
+    assert response.status_code == 400
+    assert response.get_json() == {"error": "No file provided"}
+
+
+def test_transcribe_rejects_malformed_multipart_body(client):
+    response = client.post(
+        "/api/transcribe",
+        data=b"not a multipart body",
+        headers={"Authorization": "Bearer request-key"},
+        content_type="multipart/form-data",
+    )
+
+    assert response.status_code == 400
+    assert list(api.FILES_DIR.iterdir()) == []
@@ -0,0 +1,82 @@
+import pytest
+
+import auto_transcribe
+
+
+TRANSCRIPT = {
+    "language_code": "en",
+    "language_probability": 0.987,
+    "text": "Hello world Привет",
+    "words": [
+        {"text": "Hello", "start": 0.0, "end": 0.29, "type": "word", "speaker_id": "speaker_0"},
+        {"text": "world", "start": 0.3, "end": 0.75, "type": "word", "speaker_id": "speaker_0"},
+        {"text": "laughs", "start": 0.8, "end": 1.0, "type": "audio_event", "speaker_id": "speaker_0"},
+        {"text": "Привет", "start": 2.5, "end": 3.0, "type": "word", "speaker_id": "speaker_1"},
+    ],
+}
+
+
+@pytest.mark.parametrize("seconds, expected", [
+    (None, "00:00:00,000"),
+    (0, "00:00:00,000"),
+    (0.29, "00:00:00,290"),
+    (59.9996, "00:01:00,000"),
+    (3661.5, "01:01:01,500"),
+])
+def test_format_time(seconds, expected):
+    assert auto_transcribe.format_time(seconds) == expected
+
+
+def test_save_transcript_txt(tmp_path):
+    output_path = tmp_path / "clip.txt"
+
+    auto_transcribe.save_transcript(TRANSCRIPT, output_path, "txt")
+
+    assert output_path.read_text(encoding="utf-8") == (
+        "Language: en\n"
+        "Confidence: 0.99\n"
+        "Transcription:\n"
+        "Hello world Привет\n"
+        "\n"
+        "Detailed breakdown with speakers:\n"
+        "\n"
+        "[SPEAKER_0]: Hello world (laughs) \n"
+        "[SPEAKER_1]: Привет "
+    )
+
+
+def test_save_transcript_srt(tmp_path):
+    output_path = tmp_path / "clip.srt"
+
+    auto_transcribe.save_transcript(TRANSCRIPT, output_path, "srt")
+
+    assert output_path.read_text(encoding="utf-8") == (
+        "1\n"
+        "00:00:00,000 --> 00:00:01,000\n"
+        "Hello world laughs\n"
+        "\n"
+        "2\n"
+        "00:00:02,500 --> 00:00:03,000\n"
+        "Привет\n"
+    )
+
+
+@pytest.mark.parametrize("file_name, expected", [
+    ("clip.mp3", True),
+    ("CLIP.MP3", True),
+    ("archive.tar.mp4", True),
+    ("notes.txt", False),
+    ("mp3", False),
+    (".mp3", False),
+    ("clip.", False),
+])
+def test_has_extension(file_name, expected):
+    assert auto_transcribe.has_extension(file_name, auto_transcribe.SUPPORTED_MEDIA_EXTENSIONS) is expected
+
+
+def test_get_media_files_skips_directories_and_other_files(tmp_path):
+    (tmp_path / "clip.MP3").write_bytes(b"")
+    (tmp_path / "notes.txt").write_bytes(b"")
+    (tmp_path / "folder.mp4").mkdir()
+
+    assert [p.name for p in auto_transcribe.get_media_files(tmp_path)] == ["clip.MP3"]
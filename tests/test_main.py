@@ -0,0 +1,189 @@
+import sys
+import types
+from unittest import mock
+
+import pytest
+
+import main
+
+
+def _ok_response(payload=b'{"text": "hello", "language_code": "en"}'):
+    response = mock.Mock(status_code=200, content=payload)
+    return response
+
+
+def test_transcribe_audio_file_posts_file_and_returns_result(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "ELEVENLABS_API_KEY", "test-key")
+    monkeypatch.setattr(main, "TRANSCRIPTION_CACHE_DIR", str(tmp_path / "cache"))
+    audio_path = tmp_path / "clip.mp3"
+    audio_path.write_bytes(b"audio bytes")
+
+    with mock.patch.object(main._SESSION, "post", return_value=_ok_response()) as post:
+        result = main.transcribe_audio_file(str(audio_path))
+
+    assert result == {"text": "hello", "language_code": "en"}
+    post.assert_called_once()
+    kwargs = post.call_args.kwargs
+    assert kwargs["headers"] == {"xi-api-key": "test-key"}
+    assert kwargs["files"]["file"][0] == "clip.mp3"
+    assert kwargs["data"]["model_id"] == "scribe_v1"
+
+
+def test_transcribe_audio_file_uses_cache_on_repeat(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "ELEVENLABS_API_KEY", "test-key")
+    monkeypatch.setattr(main, "TRANSCRIPTION_CACHE_DIR", str(tmp_path / "cache"))
+    audio_path = tmp_path / "clip.mp3"
+    audio_path.write_bytes(b"audio bytes")
+
+    with mock.patch.object(main._SESSION, "post", return_value=_ok_response()) as post:
+        first = main.transcribe_audio_file(str(audio_path))
+        second = main.transcribe_audio_file(str(audio_path))
+
+    assert first == second
+    post.assert_called_once()
+
+
+def test_transcribe_from_cloud_storage_sends_url(monkeypatch):
+    monkeypatch.setattr(main, "ELEVENLABS_API_KEY", "test-key")
+
+    with mock.patch.object(main._SESSION, "post", return_value=_ok_response()) as post:
+        result = main.transcribe_from_cloud_storage("https://bucket.example/clip.mp3")
+
+    assert result["text"] == "hello"
+    assert post.call_args.kwargs["data"]["cloud_storage_url"] == "https://bucket.example/clip.mp3"
+
+
+def test_transcribe_audio_file_prefers_explicit_api_key(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "ELEVENLABS_API_KEY", "env-key")
+    monkeypatch.setattr(main, "TRANSCRIPTION_CACHE_DIR", str(tmp_path / "cache"))
+    audio_path = tmp_path / "clip.mp3"
+    audio_path.write_bytes(b"audio bytes")
+
+    with mock.patch.object(main._SESSION, "post", return_value=_ok_response()) as post:
+        main.transcribe_audio_file(str(audio_path), api_key="request-key")
+
+    assert post.call_args.kwargs["headers"] == {"xi-api-key": "request-key"}
+
+
+def test_unusable_cache_dir_does_not_lose_result(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "ELEVENLABS_API_KEY", "test-key")
+    cache_path = tmp_path / "cache"
+    cache_path.write_bytes(b"not a directory")
+    monkeypatch.setattr(main, "TRANSCRIPTION_CACHE_DIR", str(cache_path))
+    audio_path = tmp_path / "clip.mp3"
+    audio_path.write_bytes(b"audio bytes")
+
+    with mock.patch.object(main._SESSION, "post", return_value=_ok_response()) as post:
+        result = main.transcribe_audio_file(str(audio_path))
+
+    assert result == {"text": "hello", "language_code": "en"}
+    post.assert_called_once()
+
+
+def test_failed_cache_write_removes_temp_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "ELEVENLABS_API_KEY", "test-key")
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(main, "TRANSCRIPTION_CACHE_DIR", str(cache_dir))
+    audio_path = tmp_path / "clip.mp3"
+    audio_path.write_bytes(b"audio bytes")
+
+    with mock.patch.object(main._SESSION, "post", return_value=_ok_response()), \
+            mock.patch.object(main.os, "replace", side_effect=PermissionError("denied")):
+        result = main.transcribe_audio_file(str(audio_path))
+
+    assert result == {"text": "hello", "language_code": "en"}
+    assert list(cache_dir.iterdir()) == []
+
+
+def test_cached_result_is_scoped_to_the_api_key(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "TRANSCRIPTION_CACHE_DIR", str(tmp_path / "cache"))
+    audio_path = tmp_path / "clip.mp3"
+    audio_path.write_bytes(b"audio bytes")
+
+    with mock.patch.object(main._SESSION, "post", return_value=_ok_response()) as post:
+        main.transcribe_audio_file(str(audio_path), api_key="first-key")
+        main.transcribe_audio_file(str(audio_path), api_key="second-key")
+        main.transcribe_audio_file(str(audio_path), api_key="first-key")
+
+    assert [c.kwargs["headers"]["xi-api-key"] for c in post.call_args_list] == ["first-key", "second-key"]
+
+
+def test_prepare_config_none_override_drops_default():
+    config = main._prepare_config({"diarize": None, "language_code": "en"})
+
+    assert "diarize" not in config
+    assert config["language_code"] == "en"
+    assert config["model_id"] == "scribe_v1"
+    assert main._prepare_config()["diarize"] is True
+
+
+def test_prepare_config_memoizes_hashable_overrides():
+    assert main._prepare_config({"num_speakers": 2}) is main._prepare_config({"num_speakers": 2})
+
+
+def test_prepare_config_handles_unhashable_overrides():
+    formats = [{"format": "srt"}]
+
+    config = main._prepare_config({"additional_formats": formats})
+
+    assert config["additional_formats"] == formats
+    assert config["model_id"] == "scribe_v1"
+    assert "additional_formats" not in main._prepare_config()
+
+@pytest.fixture
+def s3_client(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "ELEVENLABS_API_KEY", "test-key")
+    monkeypatch.setattr(main, "TRANSCRIPTION_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(main, "S3_UPLOAD_BUCKET", "uploads")
+    monkeypatch.setattr(main, "LARGE_FILE_THRESHOLD", 8)
+
+    client = mock.Mock()
+    client.generate_presigned_url.return_value = "https://uploads.example/presigned"
+    boto3 = types.ModuleType("boto3")
+    boto3.client = mock.Mock(return_value=client)
+    transfer = types.ModuleType("boto3.s3.transfer")
+    transfer.TransferConfig = mock.Mock()
+    monkeypatch.setitem(sys.modules, "boto3", boto3)
+    monkeypatch.setitem(sys.modules, "boto3.s3", types.ModuleType("boto3.s3"))
+    monkeypatch.setitem(sys.modules, "boto3.s3.transfer", transfer)
+    return client
+
+
+def test_large_file_goes_through_s3_and_is_cached(tmp_path, s3_client):
+    audio_path = tmp_path / "clip.mp3"
+    audio_path.write_bytes(b"large audio bytes")
+
+    with mock.patch.object(main._SESSION, "post", return_value=_ok_response()) as post:
+        first = main.transcribe_audio_file(str(audio_path))
+        second = main.transcribe_audio_file(str(audio_path))
+
+    assert first == second == {"text": "hello", "language_code": "en"}
+    s3_client.upload_fileobj.assert_called_once()
+    key = s3_client.upload_fileobj.call_args.args[2]
+    assert key.startswith(main.S3_UPLOAD_PREFIX) and key.endswith("-clip.mp3")
+    post.assert_called_once()
+    assert post.call_args.kwargs["data"]["cloud_storage_url"] == "https://uploads.example/presigned"
+    assert "files" not in post.call_args.kwargs
+    s3_client.delete_object.assert_called_once_with(Bucket="uploads", Key=key)
+
+
+def test_small_file_is_posted_directly(tmp_path, s3_client):
+    audio_path = tmp_path / "clip.mp3"
+    audio_path.write_bytes(b"small")
+
+    with mock.patch.object(main._SESSION, "post", return_value=_ok_response()) as post:
+        main.transcribe_audio_file(str(audio_path))
+
+    s3_client.upload_fileobj.assert_not_called()
+    assert post.call_args.kwargs["files"]["file"][0] == "clip.mp3"
+
+
+def test_failed_s3_cleanup_keeps_result(tmp_path, s3_client):
+    s3_client.delete_object.side_effect = RuntimeError("access denied")
+    audio_path = tmp_path / "clip.mp3"
+    audio_path.write_bytes(b"large audio bytes")
+
+    with mock.patch.object(main._SESSION, "post", return_value=_ok_response()):
+        result = main.transcribe_audio_file(str(audio_path))
+
+    assert result == {"text": "hello", "language_code": "en"}